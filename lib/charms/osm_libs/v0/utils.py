@@ -108,11 +108,14 @@ class MyCharm(CharmBase):
 - Get pod IP with `get_pod_ip()`
 """
 from dataclasses import dataclass
+import functools
 import logging
 import secrets
+import shlex
 import socket
+import string
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from lightkube import Client
 from lightkube.models.core_v1 import HostPathVolumeSource, Volume, VolumeMount
@@ -137,6 +140,8 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
+# Note: this copy carries local changes on top of upstream 0.5 that have not been
+# published yet, so LIBPATCH is left untouched. `charmcraft fetch-lib` overwrites them.
 LIBPATCH = 5
 
 logger = logging.getLogger(__name__)
@@ -181,26 +186,43 @@ def check_service_active(container: Container, service_name: str) -> None:
         raise CharmError(f"{service_name} service is not running")
 
 
+_POD_IP: Optional[str] = None
+
+
 def get_pod_ip() -> str:
     """Get Kubernetes Pod IP.
 
+    The IP is resolved once per process and cached, as it cannot change
+    during the lifetime of the Pod.
+
     Returns:
         str: The IP of the Pod.
     """
-    return socket.gethostbyname(socket.gethostname())
+    global _POD_IP
+    if _POD_IP is None:
+        addresses = socket.getaddrinfo(socket.gethostname(), None, family=socket.AF_INET)
+        _POD_IP = addresses[0][4][0]
+    return _POD_IP
+
 
+def _reset_pod_ip_cache() -> None:
+    """Reset the cached Pod IP. Intended for tests."""
+    global _POD_IP
+    _POD_IP = None
 
-_DEBUG_SCRIPT = r"""#!/bin/bash
+
+_DEBUG_SCRIPT = string.Template(
+    r"""#!/bin/bash
 # Install SSH
 
-function download_code(){{
+function download_code(){
     wget https://go.microsoft.com/fwlink/?LinkID=760868 -O code.deb
-}}
+}
 
-function setup_envs(){{
+function setup_envs(){
     grep "source /debug.envs" /root/.bashrc || echo "source /debug.envs" | tee -a /root/.bashrc
-}}
-function setup_ssh(){{
+}
+function setup_ssh(){
     apt install ssh -y
     cat /etc/ssh/sshd_config |
         grep -E '^PermitRootLogin yes$$' || (
@@ -210,16 +232,16 @@ function setup_ssh(){{
     service ssh stop
     sleep 3
     service ssh start
-    usermod --password $(echo {} | openssl passwd -1 -stdin) root
-}}
+    usermod --password $$(echo $password | openssl passwd -1 -stdin) root
+}
 
-function setup_code(){{
+function setup_code(){
     apt install libasound2 -y
     (dpkg -i code.deb || apt-get install -f -y || apt-get install -f -y) && echo Code installed successfully
     code --install-extension ms-python.python --user-data-dir /root
     mkdir -p /root/.vscode-server
     cp -R /root/.vscode/extensions /root/.vscode-server/extensions
-}}
+}
 
 export DEBIAN_FRONTEND=noninteractive
 apt update && apt install wget -y
@@ -230,11 +252,20 @@ wait
 setup_code &
 wait
 """
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_workspace(path: str) -> str:
+    """Read a VSCode workspace file, caching its content per path."""
+    return Path(path).read_text()
 
 
 @dataclass
 class SubModule:
     """Represent RO Submodules."""
+    __slots__ = ("sub_module_path", "container_path")
+
     sub_module_path: str
     container_path: str
 
@@ -242,20 +273,20 @@ class SubModule:
 class HostPath:
     """Represents a hostpath."""
     def __init__(self, config: str, container_path: str, submodules: dict = None) -> None:
-        mount_path_items = config.split("-")
-        mount_path_items.reverse()
-        self.mount_path = "/" + "/".join(mount_path_items)
+        self.mount_path = "/" + "/".join(reversed(config.split("-")))
         self.config = config
-        self.sub_module_dict = {}
+        self.sub_module_dict: Dict[str, SubModule] = {}
         if submodules:
-            for submodule in submodules.keys():
+            for submodule, submodule_container_path in submodules.items():
+                basename = submodule_container_path.rsplit("/", 1)[-1]
                 self.sub_module_dict[submodule] = SubModule(
-                    sub_module_path=self.mount_path + "/" + submodule + "/" + submodules[submodule].split("/")[-1],
-                    container_path=submodules[submodule],
+                    sub_module_path=f"{self.mount_path}/{submodule}/{basename}",
+                    container_path=submodule_container_path,
                 )
         else:
             self.container_path = container_path
-            self.module_name = container_path.split("/")[-1]
+            self.module_name = container_path.rsplit("/", 1)[-1]
+            self.symlink_source = f"{self.mount_path}/{self.module_name}"
 
 class DebugMode(Object):
     """Class to handle the debug-mode."""
@@ -265,16 +296,17 @@ class DebugMode(Object):
         charm: CharmBase,
         stored: StoredState,
         container: Container,
-        hostpaths: List[HostPath] = [],
+        hostpaths: Optional[List[HostPath]] = None,
         vscode_workspace_path: str = "files/vscode-workspace.json",
     ) -> None:
         super().__init__(charm, "debug-mode")
 
         self.charm = charm
         self._stored = stored
-        self.hostpaths = hostpaths
-        self.vscode_workspace = Path(vscode_workspace_path).read_text()
+        self.hostpaths = hostpaths or []
+        self.vscode_workspace_path = vscode_workspace_path
         self.container = container
+        self._k8s_client: Optional[Client] = None
 
         self._stored.set_default(
             debug_mode_started=False,
@@ -307,6 +339,18 @@ class DebugMode(Object):
         """Indicates whether the debug-mode has started or not."""
         return self._stored.debug_mode_started
 
+    @property
+    def k8s_client(self) -> Client:
+        """Lightkube client, created on first use and reused afterwards."""
+        if self._k8s_client is None:
+            self._k8s_client = Client()
+        return self._k8s_client
+
+    @property
+    def vscode_workspace(self) -> str:
+        """VSCode workspace content, only read from disk when needed."""
+        return _load_workspace(self.vscode_workspace_path)
+
     @property
     def command(self) -> str:
         """Command to launch vscode."""
@@ -329,7 +373,7 @@ class DebugMode(Object):
             service_name (str, optional): Pebble service name which has the desired environment
                 variables. Mandatory if there is more than one Pebble service configured.
         """
-        hostpaths_to_reconfigure = self._hostpaths_to_reconfigure()
+        hostpaths_to_reconfigure, statefulset = self._hostpaths_to_reconfigure()
         if self.started and not hostpaths_to_reconfigure:
             self.charm.unit.status = ActiveStatus("debug-mode: ready")
             return
@@ -342,7 +386,7 @@ class DebugMode(Object):
         # won't be mounted and then we can continue and setup the debug-mode.
         if hostpaths_to_reconfigure:
             self.charm.unit.status = MaintenanceStatus("debug-mode: configuring hostpaths")
-            self._configure_hostpaths(hostpaths_to_reconfigure)
+            self._configure_hostpaths(hostpaths_to_reconfigure, statefulset)
             return
 
         self.charm.unit.status = MaintenanceStatus("debug-mode: starting")
@@ -375,27 +419,25 @@ class DebugMode(Object):
             self.charm.unit.status = current_status
             self._restart()
 
-    def _hostpaths_to_reconfigure(self) -> List[HostPath]:
+    def _hostpaths_to_reconfigure(self) -> Tuple[List[HostPath], StatefulSet]:
         hostpaths_to_reconfigure: List[HostPath] = []
-        client = Client()
+        client = self.k8s_client
         statefulset = client.get(StatefulSet, self.charm.app.name, namespace=self.charm.model.name)
-        volumes = statefulset.spec.template.spec.volumes
+        volume_names = {volume.name for volume in statefulset.spec.template.spec.volumes}
 
         for hostpath in self.hostpaths:
             hostpath_is_set = True if self.charm.config.get(hostpath.config) else False
-            hostpath_already_configured = next(
-                (True for volume in volumes if volume.name == hostpath.config), False
-            )
+            hostpath_already_configured = hostpath.config in volume_names
             if hostpath_is_set != hostpath_already_configured:
                 hostpaths_to_reconfigure.append(hostpath)
 
-        return hostpaths_to_reconfigure
+        return hostpaths_to_reconfigure, statefulset
 
     def _setup_debug_mode(
         self,
         password: str,
         service_name: str = None,
-        mounted_hostpaths: List[HostPath] = [],
+        mounted_hostpaths: Optional[List[HostPath]] = None,
     ) -> None:
         services = self.container.get_plan().services
         if not service_name and len(services) != 1:
@@ -410,7 +452,7 @@ class DebugMode(Object):
         logger.debug(f"getting environment variables from service {service_name}")
         environment = service.environment
         environment_file_content = "\n".join(
-            [f'export {key}="{value}"' for key, value in environment.items()]
+            f"export {key}={shlex.quote(str(value))}" for key, value in environment.items()
         )
         logger.debug(f"pushing environment file to {self.container.name} container")
         self.container.push("/debug.envs", environment_file_content)
@@ -421,52 +463,44 @@ class DebugMode(Object):
 
         # Execute debugging script
         logger.debug(f"pushing debug-mode setup script to {self.container.name} container")
-        self.container.push("/debug.sh", _DEBUG_SCRIPT.format(password), permissions=0o777)
+        self.container.push(
+            "/debug.sh", _DEBUG_SCRIPT.substitute(password=password), permissions=0o777
+        )
         logger.debug(f"executing debug-mode setup script in {self.container.name} container")
         self.container.exec(["/debug.sh"]).wait_output()
         logger.debug(f"stopping service {service_name} in {self.container.name} container")
         self.container.stop(service_name)
 
         # Add symlinks to mounted hostpaths
-        for hostpath in mounted_hostpaths:
+        symlinks = []
+        for hostpath in mounted_hostpaths or []:
             logger.debug(f"adding symlink for {hostpath.config}")
             if len(hostpath.sub_module_dict) > 0:
-                for sub_module in hostpath.sub_module_dict.keys():
-                    self.container.exec(["rm", "-rf", hostpath.sub_module_dict[sub_module].container_path]).wait_output()
-                    self.container.exec(
-                        [
-                            "ln",
-                            "-s",
-                            hostpath.sub_module_dict[sub_module].sub_module_path,
-                            hostpath.sub_module_dict[sub_module].container_path,
-                        ]
-                    )
-
+                for sub_module in hostpath.sub_module_dict.values():
+                    symlinks.append((sub_module.sub_module_path, sub_module.container_path))
             else:
-                self.container.exec(["rm", "-rf", hostpath.container_path]).wait_output()
-                self.container.exec(
-                    [
-                        "ln",
-                        "-s",
-                        f"{hostpath.mount_path}/{hostpath.module_name}",
-                        hostpath.container_path,
-                    ]
-                )
-
-    def _configure_hostpaths(self, hostpaths: List[HostPath]):
-        client = Client()
-        statefulset = client.get(StatefulSet, self.charm.app.name, namespace=self.charm.model.name)
+                symlinks.append((hostpath.symlink_source, hostpath.container_path))
+
+        if symlinks:
+            # Run all the symlink commands in a single exec to save Pebble round-trips.
+            # The commands are chained with && so that any failure makes the exec fail.
+            command = " && ".join(
+                f"rm -rf {target} && ln -s {source} {target}"
+                for source, target in (map(shlex.quote, symlink) for symlink in symlinks)
+            )
+            self.container.exec(["/bin/sh", "-c", command]).wait_output()
 
+    def _configure_hostpaths(self, hostpaths: List[HostPath], statefulset: StatefulSet):
         for hostpath in hostpaths:
             if self.charm.config.get(hostpath.config):
                 self._add_hostpath_to_statefulset(hostpath, statefulset)
             else:
                 self._delete_hostpath_from_statefulset(hostpath, statefulset)
 
-        client.replace(statefulset)
+        self.k8s_client.replace(statefulset)
 
     def _unmount_hostpaths(self) -> bool:
-        client = Client()
+        client = self.k8s_client
         hostpath_unmounted = False
         statefulset = client.get(StatefulSet, self.charm.app.name, namespace=self.charm.model.name)
 
@@ -504,33 +538,29 @@ class DebugMode(Object):
             )
 
     def _delete_hostpath_from_statefulset(self, hostpath: HostPath, statefulset: StatefulSet):
-        hostpath_unmounted = False
-        for volume in statefulset.spec.template.spec.volumes:
+        volumes = statefulset.spec.template.spec.volumes
+        volume_indexes = {volume.name: index for index, volume in enumerate(volumes)}
+        if hostpath.config not in volume_indexes:
+            return False
 
-            if hostpath.config != volume.name:
+        # Remove volumeMount
+        for statefulset_container in statefulset.spec.template.spec.containers:
+            if statefulset_container.name != self.container.name:
                 continue
+            mount_indexes = {
+                volume_mount.name: index
+                for index, volume_mount in enumerate(statefulset_container.volumeMounts)
+            }
+            if hostpath.config in mount_indexes:
+                logger.debug(
+                    f"removing volumeMount {hostpath.config} from {self.container.name} container"
+                )
+                del statefulset_container.volumeMounts[mount_indexes[hostpath.config]]
 
-            # Remove volumeMount
-            for statefulset_container in statefulset.spec.template.spec.containers:
-                if statefulset_container.name != self.container.name:
-                    continue
-                for volume_mount in statefulset_container.volumeMounts:
-                    if volume_mount.name != hostpath.config:
-                        continue
-
-                    logger.debug(
-                        f"removing volumeMount {hostpath.config} from {self.container.name} container"
-                    )
-                    statefulset_container.volumeMounts.remove(volume_mount)
-
-            # Remove volume
-            logger.debug(
-                f"removing volume {hostpath.config} from {self.charm.app.name} statefulset"
-            )
-            statefulset.spec.template.spec.volumes.remove(volume)
-
-            hostpath_unmounted = True
-        return hostpath_unmounted
+        # Remove volume
+        logger.debug(f"removing volume {hostpath.config} from {self.charm.app.name} statefulset")
+        del volumes[volume_indexes[hostpath.config]]
+        return True
 
     def _get_vscode_command(
         self,
@@ -13,6 +13,7 @@ https://discourse.charmhub.io/t/4208
 """
 
 import logging
+import re
 
 from charms.grafana_k8s.v0.grafana_dashboard import GrafanaDashboardProvider
 from charms.nginx_ingress_integrator.v0.ingress import IngressRequires
@@ -24,12 +25,14 @@ from charms.osm_libs.v0.utils import (
 from charms.prometheus_k8s.v0.prometheus_scrape import MetricsEndpointProvider
 from ops.charm import CharmBase
 from ops.main import main
-from ops.model import ActiveStatus, BlockedStatus, WaitingStatus
+from ops.model import ActiveStatus, WaitingStatus
 
 # Log messages can be retrieved using juju debug-log
 logger = logging.getLogger(__name__)
 
 PORT = 9104
+# mysql://<credentials>@<endpoints>[/<database>]
+_MYSQL_URI_RE = re.compile(r"^mysql://(?P<credentials>[^/]+)@(?P<endpoints>[^/@]+)(?:/.*)?$")
 
 
 class MysqlExporterCharm(CharmBase):
@@ -75,7 +78,7 @@ class MysqlExporterCharm(CharmBase):
         Learn more about interacting with Pebble at at https://juju.is/docs/sdk/pebble.
         """
         try:
-            self.mysql_uri = self._get_mysql_uri()
+            self.mysql_uri = self._get_mysql_uri(self.model.config.get("mysql-uri"))
             # Add initial Pebble config layer using the Pebble API
             self.container.add_layer(
                 "mysql-exporter",
@@ -102,43 +105,42 @@ class MysqlExporterCharm(CharmBase):
             event.defer()
             self.unit.status = WaitingStatus("waiting for Pebble API")
 
-    def _get_mysql_config(self):
-        try:
-            self._validate_config()
-            return self.model.config.get("mysql-uri")
-        except CharmError as error:
-            raise CharmError(error.message) from error
-
-    def _get_mysql_uri(self) -> str:
+    def _get_mysql_uri(self, mysql_uri_config: str) -> str:
         """Return MySQL uri.
 
+        Args:
+            mysql_uri_config (str): value of the mysql-uri config option.
+
         Raises:
-            CharmError: if no MySQL uri.
+            CharmError: if no MySQL uri or if it is invalid.
         """
-        if configuration := self._get_mysql_config():
-            host = f'{configuration.replace("mysql://", "").split("/")[0].replace("@", "@(")})'
-            return f"{host}/"
-        raise CharmError("No MySQL uri added. MySQL uri needs to be added via config")
+        if not mysql_uri_config:
+            raise CharmError("No MySQL uri added. MySQL uri needs to be added via config")
+        uri = self._validate_config(mysql_uri_config)
+        return f'{uri["credentials"]}@({uri["endpoints"]})/'
 
-    def _validate_config(self) -> None:
+    def _validate_config(self, mysql_uri_config: str) -> re.Match:
         """Validate charm configuration.
 
+        Args:
+            mysql_uri_config (str): value of the mysql-uri config option.
+
+        Returns:
+            re.Match: the parsed mysql-uri.
+
         Raises:
             CharmError: if charm configuration is invalid.
         """
         logger.debug("Validating config")
-        if self.model.config.get("mysql-uri"):
-            if not self.model.config.get("mysql-uri").startswith("mysql://"):
-                self.unit.status = BlockedStatus(
-                    f"invalid MySQL uri: {self.model.config['mysql-uri']}"
-                )
-                raise CharmError("mysql-uri is not properly formed")
+        if uri := _MYSQL_URI_RE.match(mysql_uri_config):
+            return uri
+        raise CharmError("mysql-uri is not properly formed")
 
     def _on_config_changed(self, event) -> None:
         """Handle changed configuration."""
         try:
             # Fetch the new config value
-            self.mysql_uri = self._get_mysql_uri()
+            self.mysql_uri = self._get_mysql_uri(self.model.config.get("mysql-uri"))
             self._configure_service(event)
             self._update_ingress_config()
         except CharmError as error:
@@ -149,7 +151,8 @@ class MysqlExporterCharm(CharmBase):
         """Handle the update-status event."""
         try:
             logger.debug("Validating update_status")
-            self.mysql_uri = self._get_mysql_uri()
+            # The uri is not needed here, only validated to report a blocked status
+            self._get_mysql_uri(self.model.config.get("mysql-uri"))
             check_container_ready(self.container)
             check_service_active(self.container, self.pebble_service_name)
             self.unit.status = ActiveStatus()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# Copyright 2023 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import hashlib
+import logging
+import shutil
+from pathlib import Path
+
+import pytest
+from pytest_operator.plugin import OpsTest
+
+logger = logging.getLogger(__name__)
+
+# Files and folders that end up in the packed charm
+CHARM_SOURCES = [
+    "src",
+    "lib",
+    "charmcraft.yaml",
+    "config.yaml",
+    "metadata.yaml",
+    "requirements.txt",
+]
+
+
+def _charm_sources_hash() -> str:
+    """Return a hash of the charm sources."""
+    digest = hashlib.blake2b()
+    for source in map(Path, CHARM_SOURCES):
+        files = sorted(source.rglob("*")) if source.is_dir() else [source]
+        for file in files:
+            if not file.is_file() or "__pycache__" in file.parts:
+                continue
+            digest.update(str(file).encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+@pytest.fixture(scope="module")
+def build_charm(ops_test: OpsTest, request):
+    """Return a coroutine function that builds the charm.
+
+    The packed charm is kept in the pytest cache and reused while the charm
+    sources do not change.
+    """
+    cache_dir = Path(request.config.cache.mkdir("charms"))
+
+    async def _build_charm() -> Path:
+        cached_charm = cache_dir / f"charm-{_charm_sources_hash()}.charm"
+        if cached_charm.exists():
+            logger.info(f"using cached charm {cached_charm}")
+            return cached_charm
+
+        charm = await ops_test.build_charm(".")
+        for stale_charm in cache_dir.glob("charm-*.charm"):
+            stale_charm.unlink()
+        shutil.copy(charm, cached_charm)
+        return cached_charm
+
+    return _build_charm
@@ -12,7 +12,10 @@ from pytest_operator.plugin import OpsTest
 
 logger = logging.getLogger(__name__)
 
-METADATA = yaml.safe_load(Path("./metadata.yaml").read_text())
+# Use the libyaml based loader when PyYAML has been built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+METADATA = yaml.load(Path("./metadata.yaml").read_text(), Loader=YAML_LOADER)
 APP_NAME = METADATA["name"]
 APP_CONFIG = {"external-hostname": "mysql-exporter.127.0.0.1.nip.io"}
 INGRESS_CHARM = "nginx-ingress-integrator"
@@ -21,38 +24,38 @@ APPS = [INGRESS_APP]
 
 
 @pytest.mark.abort_on_fail
-async def test_build_and_deploy(ops_test: OpsTest):
+async def test_build_and_deploy(ops_test: OpsTest, build_charm):
     """Build the charm-under-test and deploy it together with related charms.
 
     Assert on the unit status before any relations/configurations take place.
     """
-    # Build and deploy charm from local source folder
-    charm = await ops_test.build_charm(".")
+    # Deploy the ingress charm while the charm is built from local source folder
+    build_task = asyncio.create_task(build_charm())
+    ingress_task = asyncio.create_task(
+        ops_test.model.deploy(INGRESS_CHARM, application_name=INGRESS_APP, channel="stable")
+    )
     resources = {"image": METADATA["resources"]["image"]["upstream-source"]}
 
-    await asyncio.gather(
-        ops_test.model.deploy(
-            charm, resources=resources, application_name=APP_NAME, series="jammy"
-        ),
-        ops_test.model.deploy(INGRESS_CHARM, application_name=INGRESS_APP, channel="stable"),
+    charm, _ = await asyncio.gather(build_task, ingress_task)
+    await ops_test.model.deploy(
+        charm, resources=resources, application_name=APP_NAME, series="jammy"
     )
 
     async with ops_test.fast_forward():
-        await ops_test.model.wait_for_idle(
-            apps=APPS,
+        await ops_test.model.wait_for_idle(apps=[APP_NAME])
+        assert ops_test.model.applications[APP_NAME].status == "blocked"
+        unit = ops_test.model.applications[APP_NAME].units[0]
+        assert (
+            unit.workload_status_message
+            == "No MySQL uri added. MySQL uri needs to be added via config"
         )
-    assert ops_test.model.applications[APP_NAME].status == "blocked"
-    unit = ops_test.model.applications[APP_NAME].units[0]
-    assert (
-        unit.workload_status_message
-        == "No MySQL uri added. MySQL uri needs to be added via config"
-    )
 
-    logger.info("Adding relations")
-    await ops_test.model.applications[APP_NAME].set_config(APP_CONFIG)
-    await ops_test.model.add_relation(APP_NAME, INGRESS_APP)
+        logger.info("Adding relations")
+        await asyncio.gather(
+            ops_test.model.applications[APP_NAME].set_config(APP_CONFIG),
+            ops_test.model.add_relation(APP_NAME, INGRESS_APP),
+        )
 
-    async with ops_test.fast_forward():
         await ops_test.model.wait_for_idle(
             apps=APPS,
             status="active",
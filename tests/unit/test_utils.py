@@ -0,0 +1,205 @@
+# Copyright 2023 Canonical Ltd.
+# See LICENSE file for licensing details.
+#
+# Learn more about testing at: https://juju.is/docs/sdk/testing
+
+import socket
+from unittest.mock import patch
+
+import pytest
+from charms.osm_libs.v0 import utils
+from charms.osm_libs.v0.utils import DebugMode, HostPath, get_pod_ip
+from lightkube.models.apps_v1 import StatefulSetSpec
+from lightkube.models.core_v1 import Container as PodContainer
+from lightkube.models.core_v1 import PodSpec, PodTemplateSpec, Volume, VolumeMount
+from lightkube.models.meta_v1 import LabelSelector
+from lightkube.resources.apps_v1 import StatefulSet
+from ops.charm import CharmBase
+from ops.framework import StoredState
+from ops.model import Container
+from ops.pebble import ExecError
+from ops.testing import Harness
+
+METADATA = """
+name: debug-mode-test
+containers:
+  workload:
+    resource: image
+resources:
+  image:
+    type: oci-image
+"""
+LAYER = {
+    "services": {
+        "workload": {
+            "override": "replace",
+            "command": "/bin/workload",
+            "startup": "enabled",
+            "environment": {"KEY": "value", "QUOTED": 'say "hi" $HOME'},
+        }
+    }
+}
+MODULE_HOSTPATH = HostPath(
+    config="module-hostpath", container_path="/usr/lib/python3/dist-packages/module"
+)
+SUBMODULES_HOSTPATH = HostPath(
+    config="ro-hostpath",
+    container_path="",
+    submodules={"lib": "/usr/lib/python3/dist-packages/lib"},
+)
+
+
+class DebugModeCharm(CharmBase):
+    _stored = StoredState()
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.debug_mode = DebugMode(
+            self,
+            self._stored,
+            self.unit.get_container("workload"),
+            [MODULE_HOSTPATH, SUBMODULES_HOSTPATH],
+        )
+
+
+@pytest.fixture
+def harness(tmp_path):
+    harness = Harness(DebugModeCharm, meta=METADATA)
+    harness.begin()
+    workspace = tmp_path / "vscode-workspace.json"
+    workspace.write_text("{}")
+    harness.charm.debug_mode.vscode_workspace_path = str(workspace)
+    harness.set_can_connect("workload", True)
+    container = harness.model.unit.get_container("workload")
+    container.add_layer("workload", LAYER)
+    container.replan()
+    yield harness
+    harness.cleanup()
+
+
+def test_setup_debug_mode_symlinks_in_one_exec(harness):
+    """All the symlinks are set up by a single exec, failing on any error."""
+    with patch.object(Container, "exec") as exec_mock:
+        harness.charm.debug_mode._setup_debug_mode(
+            "password", mounted_hostpaths=[MODULE_HOSTPATH, SUBMODULES_HOSTPATH]
+        )
+
+    assert exec_mock.call_count == 2
+    exec_mock.assert_called_with(
+        [
+            "/bin/sh",
+            "-c",
+            "rm -rf /usr/lib/python3/dist-packages/module"
+            " && ln -s /hostpath/module/module /usr/lib/python3/dist-packages/module"
+            " && rm -rf /usr/lib/python3/dist-packages/lib"
+            " && ln -s /hostpath/ro/lib/lib /usr/lib/python3/dist-packages/lib",
+        ]
+    )
+
+
+def test_setup_debug_mode_environment_file(harness):
+    """The service environment is exported with shell-quoted values."""
+    with patch.object(Container, "exec"):
+        harness.charm.debug_mode._setup_debug_mode("password")
+
+    container = harness.model.unit.get_container("workload")
+    environment_file = container.pull("/debug.envs").read()
+    assert environment_file == "export KEY=value\nexport QUOTED='say \"hi\" $HOME'"
+
+
+def test_setup_debug_mode_symlink_error(harness):
+    """A failing symlink command is raised."""
+    error = ExecError(["/bin/sh"], 1, "", "ln: failed to create symbolic link")
+    with patch.object(Container, "exec") as exec_mock:
+        exec_mock.return_value.wait_output.side_effect = [("", ""), error]
+        with pytest.raises(ExecError):
+            harness.charm.debug_mode._setup_debug_mode(
+                "password", mounted_hostpaths=[MODULE_HOSTPATH]
+            )
+
+
+def test_get_pod_ip_is_cached():
+    """The pod IP is resolved once and then served from the cache."""
+    utils._reset_pod_ip_cache()
+    addresses = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.1.2.3", 0))]
+    with patch("socket.getaddrinfo", return_value=addresses) as getaddrinfo_mock:
+        assert get_pod_ip() == "10.1.2.3"
+        assert get_pod_ip() == "10.1.2.3"
+    utils._reset_pod_ip_cache()
+
+    getaddrinfo_mock.assert_called_once_with(socket.gethostname(), None, family=socket.AF_INET)
+
+
+def _statefulset(volume_names, mounts_by_container):
+    return StatefulSet(
+        spec=StatefulSetSpec(
+            selector=LabelSelector(),
+            template=PodTemplateSpec(
+                spec=PodSpec(
+                    containers=[
+                        PodContainer(
+                            name=name,
+                            volumeMounts=[
+                                VolumeMount(mountPath=f"/{mount}", name=mount) for mount in mounts
+                            ],
+                        )
+                        for name, mounts in mounts_by_container.items()
+                    ],
+                    volumes=[Volume(name) for name in volume_names],
+                )
+            ),
+        )
+    )
+
+
+def test_delete_hostpath_from_statefulset(harness):
+    """Only the hostpath volume and its mount in the workload container are removed."""
+    statefulset = _statefulset(
+        ["charm-data", "module-hostpath", "other"],
+        {
+            "workload": ["charm-data", "module-hostpath", "other"],
+            "sidecar": ["module-hostpath"],
+        },
+    )
+
+    assert harness.charm.debug_mode._delete_hostpath_from_statefulset(MODULE_HOSTPATH, statefulset)
+
+    pod_spec = statefulset.spec.template.spec
+    assert [volume.name for volume in pod_spec.volumes] == ["charm-data", "other"]
+    workload, sidecar = pod_spec.containers
+    assert [mount.name for mount in workload.volumeMounts] == ["charm-data", "other"]
+    assert [mount.name for mount in sidecar.volumeMounts] == ["module-hostpath"]
+
+
+def test_delete_hostpath_from_statefulset_not_mounted(harness):
+    """Nothing is removed if the hostpath is not in the statefulset."""
+    statefulset = _statefulset(["charm-data"], {"workload": ["charm-data"]})
+
+    assert not harness.charm.debug_mode._delete_hostpath_from_statefulset(
+        MODULE_HOSTPATH, statefulset
+    )
+
+    pod_spec = statefulset.spec.template.spec
+    assert [volume.name for volume in pod_spec.volumes] == ["charm-data"]
+    assert [mount.name for mount in pod_spec.containers[0].volumeMounts] == ["charm-data"]
+
+
+def test_debug_script_substitution():
+    """The password is filled in and the shell syntax is kept as is."""
+    script = utils._DEBUG_SCRIPT.substitute(password="secret")
+
+    assert "function download_code(){\n" in script
+    assert "grep -E '^PermitRootLogin yes$' || (" in script
+    assert "usermod --password $(echo secret | openssl passwd -1 -stdin) root" in script
+    assert "$password" not in script
+    assert "$$" not in script
+
+
+def test_setup_debug_mode_pushes_debug_script(harness):
+    """The debug-mode script is pushed with the password and made executable."""
+    with patch.object(Container, "exec"):
+        harness.charm.debug_mode._setup_debug_mode("secret")
+
+    container = harness.model.unit.get_container("workload")
+    assert container.pull("/debug.sh").read() == utils._DEBUG_SCRIPT.substitute(password="secret")
+    assert container.list_files("/debug.sh")[0].permissions == 0o777